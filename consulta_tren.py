@@ -15,13 +15,132 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+)
 from datetime import datetime, timedelta
-import time
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import copy
+import os
+import queue
+import threading
 import re
+import time
+import urllib3
 import logging
+from logging.handlers import MemoryHandler, RotatingFileHandler
 import argparse
-from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+from typing import Any, List, Dict, Optional, Tuple, Union
+
+from station_cache import delete_station, get_station, set_station
+
+try:
+    import lxml.html
+except ImportError:  # Results are only read through executeScript
+    lxml = None
+
+try:
+    import diskcache
+except ImportError:  # Results are never cached
+    diskcache = None
+
+
+# Autocomplete suggestions shown under the station inputs
+AUTOCOMPLETE_XPATH = "//div[contains(@class, 'autocomplete')]//li"
+
+# Selectors and patterns for the trip results, built once
+_TIPO_RE = re.compile(r'Tipo de tren (\w+)')
+_TRIP_IMG_CSS = "img.img-fluid"
+_DURATION_CSS = "span.text-number"
+_PRICE_CSS = "span.precio-final"
+_HORAS_TAG = "h5"
+
+# Reads every trip's fields in a single WebDriver round-trip
+_EXTRACT_TRIPS_JS = f"""
+return Array.from(document.querySelectorAll('.selectedTren')).map(el => {{
+    const text = node => node ? node.innerText : null;
+    const img = el.querySelector('{_TRIP_IMG_CSS}');
+    return {{
+        tipo: img ? img.getAttribute('alt') : null,
+        horas: Array.from(el.querySelectorAll('{_HORAS_TAG}')).map(text),
+        duracion: text(el.querySelector('{_DURATION_CSS}')),
+        precio: text(el.querySelector('{_PRICE_CSS}')),
+        completo: Array.from(el.querySelectorAll('div#boton-style'))
+            .some(div => div.textContent.includes('Tren Completo'))
+    }};
+}});
+"""
+
+# Empties an input, lets its autocomplete widget know and focuses it
+_RESET_FIELD_JS = """
+const e = document.getElementById(arguments[0]);
+if (!e) return false;
+e.value = '';
+e.dispatchEvent(new Event('input', {bubbles: true}));
+e.focus();
+return true;
+"""
+
+# Same selectors as XPath, for parsing the page source with lxml
+_TRIP_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' selectedTren ')]"
+_TRIP_IMG_ALT_XPATH = ".//img[contains(concat(' ', normalize-space(@class), ' '), ' img-fluid ')][1]/@alt"
+_HORAS_XPATH = f".//{_HORAS_TAG}"
+_DURATION_XPATH = ".//span[contains(concat(' ', normalize-space(@class), ' '), ' text-number ')][1]"
+_PRICE_XPATH = ".//span[contains(concat(' ', normalize-space(@class), ' '), ' precio-final ')][1]"
+_FULL_TRAIN_XPATH = ".//div[@id='boton-style' and contains(., 'Tren Completo')]"
+
+_DAYS_RANGE_RE = re.compile(r'(\d+)-(\d+)')
+_TIME_RE = re.compile(r'([01]?\d|2[0-3]):[0-5]\d')
+
+
+def _format_date(date: datetime) -> str:
+    """Format a date as DD/MM/YYYY"""
+    return f"{date.day:02d}/{date.month:02d}/{date.year}"
+
+
+# Consent banner, analytics and ad scripts the scraper never needs
+BLOCKED_URLS = [
+    "*cookielaw.org*",
+    "*onetrust.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*adobedtm.com*",
+    "*omtrdc.net*",
+    "*doubleclick.net*",
+]
+
+# Cookies OneTrust writes once the banner has been answered, set before loading the page so it
+# never shows. Hand-written following OneTrust's cookie format (not captured from renfe.com):
+# only group C0001 (strictly necessary cookies) is accepted, analytics and targeting stay off.
+ONETRUST_CONSENT_COOKIES = [
+    {"name": "OptanonAlertBoxClosed", "value": "2024-01-01T00:00:00.000Z"},
+    {"name": "OptanonConsent", "value": (
+        "isGpcEnabled=0&isIABGlobal=false&hosts=&interactionCount=1&landingPath=NotLandingPage"
+        "&groups=C0001%3A1&AwaitingReconsent=false"
+    )},
+]
+
+# Chrome profiles reused across runs (one numbered subdirectory per browser)
+CHROME_PROFILE_DIR = Path.home() / ".cache" / "renfe" / "chrome-profile"
+
+# Search results, keyed by route, date and train types
+RESULTS_CACHE_DIR = Path.home() / ".cache" / "renfe" / "results"
+DEFAULT_CACHE_TTL = 300
+_results_cache = None
+_results_cache_lock = threading.Lock()
+
+
+def _get_results_cache() -> Optional["diskcache.Cache"]:
+    """Open the on-disk results cache on first use"""
+    global _results_cache
+    if diskcache is None:
+        return None
+    with _results_cache_lock:
+        if _results_cache is None:
+            _results_cache = diskcache.Cache(str(RESULTS_CACHE_DIR))
+        return _results_cache
 
 
 class TrainType:
@@ -37,6 +156,133 @@ class RenfeError(Exception):
     pass
 
 
+class DriverPool:
+    """Bounded pool of warm Chrome sessions shared across scraper runs.
+
+    Drivers are keyed by their option set so that scrapers configured the
+    same way reuse the same browsers instead of cold-starting Chrome. When a
+    profile directory is given, each browser gets its own numbered profile
+    under it (Chrome locks a profile to one running instance), so cookies
+    and HTTP cache survive across runs.
+    """
+    max_size = 4
+    # Connections kept open to each chromedriver
+    connections_per_driver = 20
+    # Cookies kept when a driver is returned to the pool (cookie consent)
+    preserved_cookies = ("OptanonAlertBoxClosed", "OptanonConsent")
+    _pools: Dict[Tuple[str, ...], "queue.Queue"] = {}
+    _profiles_in_use: set = set()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(options: webdriver.ChromeOptions) -> Tuple[str, ...]:
+        return tuple(sorted(options.arguments)) + tuple(
+            f"{name}={value}" for name, value in sorted(options.experimental_options.items(), key=lambda kv: kv[0])
+        )
+
+    @classmethod
+    def _queue(cls, key: Tuple[str, ...]) -> "queue.Queue":
+        with cls._lock:
+            if key not in cls._pools:
+                cls._pools[key] = queue.Queue(maxsize=cls.max_size)
+            return cls._pools[key]
+
+    @classmethod
+    def acquire(cls, options: webdriver.ChromeOptions, profile_dir: Optional[Path] = None) -> webdriver.Chrome:
+        """Return an idle driver for these options, launching one if none is free"""
+        pool = cls._queue(cls._key(options))
+        while True:
+            try:
+                driver = pool.get_nowait()
+            except queue.Empty:
+                driver = cls._launch(options, profile_dir)
+                driver._renfe_pool_key = cls._key(options)
+                cls._tune_connection(driver)
+                return driver
+            if driver.session_id is not None:
+                return driver
+            cls._discard(driver)
+
+    @classmethod
+    def _launch(cls, options: webdriver.ChromeOptions, profile_dir: Optional[Path]) -> webdriver.Chrome:
+        """Start Chrome, on a persistent profile if one is free"""
+        profile = None
+        if profile_dir is not None:
+            with cls._lock:
+                slot = 0
+                while profile_dir / str(slot) in cls._profiles_in_use:
+                    slot += 1
+                profile = profile_dir / str(slot)
+                cls._profiles_in_use.add(profile)
+
+        if profile is not None:
+            try:
+                profile.mkdir(parents=True, exist_ok=True)
+                profile_options = copy.deepcopy(options)
+                profile_options.add_argument(f"--user-data-dir={profile}")
+                driver = webdriver.Chrome(options=profile_options, keep_alive=True)
+                driver._renfe_profile = profile
+                return driver
+            except (OSError, WebDriverException):
+                # Profile in use by another process or not writable: run without it
+                with cls._lock:
+                    cls._profiles_in_use.discard(profile)
+
+        driver = webdriver.Chrome(options=options, keep_alive=True)
+        driver._renfe_profile = None
+        return driver
+
+    @classmethod
+    def _tune_connection(cls, driver: webdriver.Chrome):
+        """Let the WebDriver client keep more keep-alive connections to chromedriver"""
+        conn = getattr(driver.command_executor, "_conn", None)
+        if isinstance(conn, urllib3.PoolManager):
+            conn.connection_pool_kw.update(maxsize=cls.connections_per_driver, block=False)
+            conn.clear()  # Drop pools built with the old size
+    
+    @classmethod
+    def release(cls, driver: webdriver.Chrome):
+        """Reset a driver's browsing state and return it to the pool"""
+        try:
+            if driver.session_id is None:
+                raise RenfeError("Driver session is gone")
+            for cookie in driver.get_cookies():
+                if cookie["name"] not in cls.preserved_cookies:
+                    driver.delete_cookie(cookie["name"])
+            driver.get("about:blank")
+            cls._queue(driver._renfe_pool_key).put_nowait(driver)
+        except Exception:
+            # Dead session or full pool: don't keep it around
+            cls._discard(driver)
+
+    @classmethod
+    def close_all(cls):
+        """Quit every idle driver in the pool"""
+        with cls._lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            while True:
+                try:
+                    cls._discard(pool.get_nowait())
+                except queue.Empty:
+                    break
+
+    @classmethod
+    def _discard(cls, driver: webdriver.Chrome):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        profile = getattr(driver, "_renfe_profile", None)
+        if profile is not None:
+            with cls._lock:
+                cls._profiles_in_use.discard(profile)
+
+
+atexit.register(DriverPool.close_all)
+
+
 class RenfeSeleniumScraper:
     def __init__(self, 
                  origin: str = "Girona",
@@ -44,7 +290,9 @@ class RenfeSeleniumScraper:
                  days_from_now: int = 1,
                  train_types: List[str] = None,
                  time_filter: Optional[Tuple[str, str]] = None,
-                 verbose: bool = True):
+                 verbose: bool = True,
+                 cache_ttl: int = DEFAULT_CACHE_TTL,
+                 today: Optional[datetime] = None):
         """
         Initialize the scraper with customizable parameters.
         
@@ -55,10 +303,13 @@ class RenfeSeleniumScraper:
             train_types: List of train types to include (default: [AVE, AVANT])
             time_filter: Optional tuple of (filter_type, time_value) where filter_type is 'before' or 'after'
             verbose: Whether to print detailed logs
+            cache_ttl: Seconds to reuse results of an identical search (0 disables the cache)
+            today: Date days_from_now counts from (default: now); lets a batch of searches agree on it
         """
         self.origin = origin
         self.destination = destination
         self.verbose = verbose
+        self.cache_ttl = cache_ttl
         
         # Configure logging based on verbosity
         self._setup_logging()
@@ -68,11 +319,12 @@ class RenfeSeleniumScraper:
             raise ValueError("days_from_now must be between 0 and 15")
         
         # Calculate the search date
-        target_date = datetime.now() + timedelta(days=days_from_now)
+        target_date = (today or datetime.now()) + timedelta(days=days_from_now)
         self.day = target_date.day
         self.month = target_date.month
         self.year = target_date.year
-        self.date_str = target_date.strftime("%d/%m/%Y")
+        self.date_str = _format_date(target_date)
+        self._day_xpath = f"//div[contains(@class, 'lightpick__day') and text()='{self.day}' and not(contains(@class, 'is-previous-month')) and not(contains(@class, 'is-next-month'))]"
         
         # Configure train types to search for
         self.train_types = train_types if train_types else [TrainType.AVE, TrainType.AVANT]
@@ -82,22 +334,42 @@ class RenfeSeleniumScraper:
         # Set time filter
         self.time_filter = time_filter
         
-        # Configure WebDriver
+        # Configure WebDriver options; the browser itself comes from DriverPool in run()
+        self.driver = None
+        self._trackers_blocked = False
+        self._consent_injected = False
         self._setup_driver()
     
     def _setup_logging(self):
         """Configure logging based on verbosity setting"""
-        # Clear any existing handlers
+        # Clear any existing handlers; only close (and flush) the ones installed here
         for handler in logging.root.handlers[:]:
             logging.root.removeHandler(handler)
+            if getattr(handler, "_renfe_handler", False):
+                # MemoryHandler.close() flushes but leaves its target open
+                target = getattr(handler, "target", None)
+                handler.close()
+                if target is not None:
+                    target.close()
         
         # Set up logging
         log_level = logging.INFO if self.verbose else logging.WARNING
-        handlers = [logging.FileHandler('renfe_scraper.log')]
-        
         if self.verbose:
-            handlers.append(logging.StreamHandler())
+            # Write the log file in batches rather than once per record
+            file_handler = RotatingFileHandler('renfe_scraper.log', maxBytes=1_000_000, backupCount=3)
+            handlers = [
+                MemoryHandler(100, flushLevel=logging.ERROR, target=file_handler),
+                logging.StreamHandler()
+            ]
+        else:
+            # Quiet mode: no log file, only warnings and errors on stderr
+            stderr_handler = logging.StreamHandler()
+            stderr_handler.setLevel(logging.WARNING)
+            handlers = [stderr_handler]
             
+        for handler in handlers:
+            handler._renfe_handler = True
+        
         logging.basicConfig(
             level=log_level,
             format='%(asctime)s - %(levelname)s - %(message)s',
@@ -119,20 +391,52 @@ class RenfeSeleniumScraper:
         self.options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.options.add_experimental_option('useAutomationExtension', False)
         self.options.add_argument("--headless")  # Run Chrome in headless mode (no GUI)
-
         
-        self.driver = webdriver.Chrome(options=self.options)
-        self.wait = WebDriverWait(self.driver, 20)
+        # Don't download images: only their alt text is read, which comes with the HTML
+        self.options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        self.options.add_argument("--blink-settings=imagesEnabled=false")
+        
+        # Persistent profile so cookie consent and HTTP cache survive across runs
+        self.profile_dir = CHROME_PROFILE_DIR
         
+    def _block_trackers(self):
+        """Block consent banner, analytics and ad requests through the DevTools protocol"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+            self._trackers_blocked = True
+        except WebDriverException as e:
+            self._trackers_blocked = False
+            self.logger.warning(f"Could not block tracker URLs: {e}")
+    
+    def _inject_consent(self):
+        """Store the cookie consent up front so the banner is never shown"""
+        cookies = [
+            dict(cookie, domain=".renfe.com", path="/", secure=True)
+            for cookie in ONETRUST_CONSENT_COOKIES
+        ]
+        try:
+            # Through CDP, so no extra page load is needed to be on the renfe.com domain
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            self._consent_injected = True
+        except WebDriverException as e:
+            self._consent_injected = False
+            self.logger.warning(f"Could not set consent cookies: {e}")
+    
     def _accept_cookies(self):
-        """Accept cookies if the banner appears"""
+        """Accept cookies if the banner appears (fallback when it couldn't be suppressed)"""
+        if self._trackers_blocked or self._consent_injected:
+            # The OneTrust script is blocked or consent is already stored, so the banner never shows up
+            return
+        
         try:
-            accept_btn = self.wait.until(
+            # Short wait: with a persistent profile the banner is usually already dismissed
+            accept_btn = self.wait_fast.until(
                 EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
             )
             accept_btn.click()
             self.logger.info("Cookies accepted")
-            time.sleep(1)
+            self.wait.until(EC.invisibility_of_element_located((By.ID, "onetrust-banner-sdk")))
         except TimeoutException:
             self.logger.info("No cookie banner found")
     
@@ -142,55 +446,110 @@ class RenfeSeleniumScraper:
             # Wait for field to be clickable
             field = self.wait.until(EC.element_to_be_clickable((By.ID, field_id)))
             
-            # Clear field with multiple methods to ensure it's empty
-            field.click()
-            field.clear()
-            field.send_keys(Keys.CONTROL + "a")
-            field.send_keys(Keys.DELETE)
-            time.sleep(0.5)
+            # Empty the field and reset the autocomplete in one command
+            self._reset_field(field_id)
+            
+            # Stations resolved on a previous run skip the autocomplete entirely
+            cached = get_station(station_name)
+            if cached and cached.get("canonical"):
+                if self._fill_station_from_cache(field, field_id, cached["canonical"]):
+                    self.logger.info(f"{field_type.capitalize()} selected from cache: {cached['canonical']}")
+                    return
+                # Stale entry: forget it and go through the autocomplete
+                self.logger.warning(f"Cached {field_type} '{cached['canonical']}' was not accepted, using autocomplete")
+                delete_station(station_name)
+                self._reset_field(field_id)
             
             # Type station name
             field.send_keys(station_name)
-            time.sleep(2)  # Increased wait time for autocomplete
             
-            # Try to select from autocomplete
+            # Try to select from autocomplete as soon as suggestions show up
             try:
                 suggestions = self.wait.until(
-                    EC.presence_of_all_elements_located(
-                        (By.XPATH, "//div[contains(@class, 'autocomplete')]//li")
-                    )
+                    EC.presence_of_all_elements_located((By.XPATH, AUTOCOMPLETE_XPATH))
                 )
                 
                 # Special handling for common stations
+                chosen = None
                 if field_type == "destination":
-                    for suggestion in suggestions:
-                        if station_name.upper() in suggestion.text.upper():
-                            suggestion.click()
-                            self.logger.info(f"{field_type.capitalize()} selected: {station_name}")
-                            return
+                    chosen = next(
+                        (suggestion for suggestion in suggestions if station_name.upper() in suggestion.text.upper()), None
+                    )
                 
                 # Default to first suggestion if no specific match found
-                if suggestions:
-                    suggestions[0].click()
+                if chosen is None and suggestions:
+                    chosen = suggestions[0]
+                
+                if chosen is not None:
+                    # Only remember suggestions that actually match what was typed
+                    matches = station_name.upper() in chosen.text.upper()
+                    chosen.click()
+                    self.wait.until(EC.invisibility_of_element_located((By.XPATH, AUTOCOMPLETE_XPATH)))
+                    # Cache what the input ends up holding, since that is what the cached path checks
+                    canonical = self._field_value(field_id)
+                    if matches and canonical:
+                        set_station(station_name, canonical=canonical)
                     self.logger.info(f"{field_type.capitalize()} selected: {station_name}")
+                    return
                 
             except TimeoutException:
                 # Fallback to keyboard navigation
                 field.send_keys(Keys.ARROW_DOWN, Keys.ENTER)
                 self.logger.info(f"{field_type.capitalize()} selected via keyboard")
             
-            time.sleep(1)
+            # Wait for the suggestion list to close
+            self.wait.until(EC.invisibility_of_element_located((By.XPATH, AUTOCOMPLETE_XPATH)))
             
         except Exception as e:
             raise RenfeError(f"Error filling {field_type}: {e}")
     
+    def _fill_station_from_cache(self, field, field_id: str, canonical: str) -> bool:
+        """Type a cached station name and confirm it; returns False if the form didn't take it"""
+        field.send_keys(canonical)
+        field.send_keys(Keys.ENTER)
+        
+        def accepted(driver):
+            value = self._field_value(field_id)
+            suggestions_open = any(el.is_displayed() for el in driver.find_elements(By.XPATH, AUTOCOMPLETE_XPATH))
+            return value == canonical and not suggestions_open
+        
+        try:
+            self.wait_fast.until(accepted)
+            return True
+        except TimeoutException:
+            return False
+    
+    def _field_value(self, field_id: str) -> str:
+        """Current value of a form input"""
+        return self.driver.execute_script("return document.getElementById(arguments[0]).value;", field_id) or ""
+    
+    def _field_present(self, field_id: str) -> bool:
+        """Check that a form input still exists, i.e. the page doesn't need reloading"""
+        try:
+            return bool(self.driver.find_elements(By.ID, field_id))
+        except WebDriverException:
+            return False
+    
+    def _reset_field(self, field_id: str) -> bool:
+        """Empty and focus a form input in place; returns False if the page is unusable"""
+        try:
+            return bool(self.driver.execute_script(_RESET_FIELD_JS, field_id))
+        except WebDriverException:
+            return False
+    
+    def _reload_form(self):
+        """Reload the search page from scratch"""
+        self.driver.refresh()
+        self.wait.until(EC.presence_of_element_located((By.ID, "origin")))
+        self._accept_cookies()
+    
     def _select_date(self):
         """Select the desired date from the calendar"""
         try:
             # Open calendar
             date_input = self.driver.find_element(By.ID, "first-input")
             date_input.click()
-            time.sleep(2)
+            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "lightpick__day")))
             
             # Select one-way trip
             solo_ida_label = self.wait.until(
@@ -198,18 +557,15 @@ class RenfeSeleniumScraper:
             )
             solo_ida_label.click()
             self.logger.info("One-way trip selected")
-            time.sleep(1)
             
             # Select the date
-            day_selector = f"//div[contains(@class, 'lightpick__day') and text()='{self.day}' and not(contains(@class, 'is-previous-month')) and not(contains(@class, 'is-next-month'))]"
-            day_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, day_selector)))
+            day_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, self._day_xpath)))
             day_element.click()
             self.logger.info(f"Date {self.date_str} selected")
-            time.sleep(1)
             
             # Click accept button if present
             try:
-                accept_btn = self.wait.until(
+                accept_btn = self.wait_fast.until(
                     EC.element_to_be_clickable(
                         (By.CSS_SELECTOR, "#datepickerv2 > section > div.lightpick__footer-buttons > button.lightpick__apply-action-sub")
                     )
@@ -219,8 +575,6 @@ class RenfeSeleniumScraper:
             except TimeoutException:
                 pass  # Accept button not always present
             
-            time.sleep(2)
-            
         except Exception as e:
             raise RenfeError(f"Error selecting date: {e}")
     
@@ -229,7 +583,6 @@ class RenfeSeleniumScraper:
         try:
             # Scroll to top to ensure visibility
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.5)
             
             # Find and click search button
             search_btn = self.wait.until(
@@ -240,61 +593,44 @@ class RenfeSeleniumScraper:
             self.driver.execute_script("arguments[0].click();", search_btn)
             self.logger.info("Search initiated")
             
-            # Wait for results to load
-            time.sleep(15)  # Allow time for results to load
+            # Wait for the results page to replace the search form
+            self.wait.until(EC.staleness_of(search_btn))
+            try:
+                self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "selectedTren")))
+            except TimeoutException:
+                self.logger.warning("No trip results appeared before timeout")
             
         except Exception as e:
             raise RenfeError(f"Error searching for trips: {e}")
     
-    def _extract_trip_info(self, trip_element) -> Dict[str, str]:
-        """Extract information from a single trip element"""
+    def _parse_trip(self, raw: Dict[str, Any]) -> Dict[str, str]:
+        """Turn the raw fields read from one trip element into trip info"""
         trip_info = {}
         
-        try:
-            # Extract train type from image alt text
-            img_elem = trip_element.find_element(By.CSS_SELECTOR, "img.img-fluid")
-            alt_text = img_elem.get_attribute("alt")
-            
-            if "Tipo de tren" in alt_text:
-                tipo_match = re.search(r'Tipo de tren (\w+)', alt_text)
-                if tipo_match:
-                    trip_info['tipo'] = tipo_match.group(1)
-                else:
-                    trip_info['tipo'] = alt_text.replace('Tipo de tren ', '').strip()
-
-        except:
+        # Extract train type from image alt text
+        alt_text = raw.get('tipo')
+        if alt_text is None:
             trip_info['tipo'] = 'N/A'
+        elif "Tipo de tren" in alt_text:
+            tipo_match = _TIPO_RE.search(alt_text)
+            if tipo_match:
+                trip_info['tipo'] = tipo_match.group(1)
+            else:
+                trip_info['tipo'] = alt_text.replace('Tipo de tren ', '').strip()
         
-        try:
-            # Extract departure and arrival times
-            horas = trip_element.find_elements(By.TAG_NAME, "h5")
-            if len(horas) >= 2:
-                trip_info['salida'] = horas[0].text.replace("h", "").strip()
-                trip_info['llegada'] = horas[1].text.replace("h", "").strip()
-        except:
-            pass
+        # Departure and arrival times
+        horas = raw.get('horas') or []
+        if len(horas) >= 2:
+            trip_info['salida'] = horas[0].replace("h", "").strip()
+            trip_info['llegada'] = horas[1].replace("h", "").strip()
         
-        try:
-            # Extract duration
-            duracion_elem = trip_element.find_element(By.CSS_SELECTOR, "span.text-number")
-            trip_info['duracion'] = duracion_elem.text.strip()
-        except:
-            pass
+        if raw.get('duracion') is not None:
+            trip_info['duracion'] = raw['duracion'].strip()
         
-        try:
-            # Extract price
-            precio_elem = trip_element.find_element(By.CSS_SELECTOR, "span.precio-final")
-            precio_text = precio_elem.text
-            trip_info['precio'] = precio_text.split("desde")[-1].strip()
-        except:
-            pass
-
-        try:
-            full_train_button = trip_element.find_element(By.XPATH, ".//div[@id='boton-style' and contains(., 'Tren Completo')]")
-            trip_info["completo"] = True
-        except:
-            trip_info["completo"] = False
+        if raw.get('precio') is not None:
+            trip_info['precio'] = raw['precio'].split("desde")[-1].strip()
         
+        trip_info['completo'] = bool(raw.get('completo'))
         return trip_info
     
     def _filter_by_time(self, trips: List[Dict[str, str]]) -> List[Dict[str, str]]:
@@ -309,90 +645,185 @@ class RenfeSeleniumScraper:
         filter_hour, filter_minute = map(int, time_value.split(':'))
         filter_minutes = filter_hour * 60 + filter_minute
         
+        keep_before = filter_type == 'before'
         filtered_trips = []
         for trip in trips:
             departure_time = trip.get('salida', '')
             if not departure_time:
                 continue
-                
-            # Convert departure time to minutes for comparison
-            try:
-                # Handle different time formats (08:30 or 8:30)
-                parts = departure_time.split(':')
-                if len(parts) == 2:
-                    hour, minute = map(int, parts)
-                else:
-                    # Try to handle format like "8.30"
-                    parts = departure_time.replace('.', ':').split(':')
-                    hour, minute = map(int, parts)
-                
-                departure_minutes = hour * 60 + minute
-                
-                # Apply filter
-                if filter_type == 'before' and departure_minutes <= filter_minutes:
-                    filtered_trips.append(trip)
-                elif filter_type == 'after' and departure_minutes >= filter_minutes:
-                    filtered_trips.append(trip)
-            except ValueError:
+            
+            departure_minutes = self._to_minutes(departure_time)
+            if departure_minutes < 0:
                 # If time parsing fails, include the trip to be safe
                 filtered_trips.append(trip)
                 self.logger.warning(f"Could not parse departure time: {departure_time}")
-                
+            elif (departure_minutes <= filter_minutes) if keep_before else (departure_minutes >= filter_minutes):
+                filtered_trips.append(trip)
+        
         return filtered_trips
     
+    @staticmethod
+    def _to_minutes(time_text: str) -> int:
+        """Convert a departure time (08:30, 8:30 or 8.30) to minutes since midnight, or -1 if unparseable"""
+        hour, _, minute = time_text.replace('.', ':').partition(':')
+        try:
+            return int(hour) * 60 + int(minute)
+        except ValueError:
+            return -1
+    
+    def _filter_by_type(self, trips: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Keep only trips matching the requested train types"""
+        return [
+            trip for trip in trips
+            if (trip.get('tipo', 'N/A') in self.train_types or
+                (trip.get('tipo', 'N/A') == 'N/A' and 'ALL' in self.train_types))
+        ]
+    
+    def _extract_raw_trips_lxml(self) -> List[Dict[str, Any]]:
+        """Read the raw trip fields by parsing the page source with lxml"""
+        def text(nodes):
+            return " ".join(nodes[0].text_content().split()) if nodes else None
+        
+        root = lxml.html.fromstring(self.driver.page_source)
+        trips_raw = []
+        for el in root.xpath(_TRIP_XPATH):
+            alt = el.xpath(_TRIP_IMG_ALT_XPATH)
+            trips_raw.append({
+                'tipo': str(alt[0]) if alt else None,
+                'horas': [text([h]) for h in el.xpath(_HORAS_XPATH)],
+                'duracion': text(el.xpath(_DURATION_XPATH)),
+                'precio': text(el.xpath(_PRICE_XPATH)),
+                'completo': bool(el.xpath(_FULL_TRAIN_XPATH)),
+            })
+        return trips_raw
+    
     def _extract_results(self) -> List[Dict[str, str]]:
         """Extract all trip results from the page"""
-        trips = []
-        
         try:
-            # Find all trip elements
-            trip_elements = self.driver.find_elements(By.CLASS_NAME, "selectedTren")
-            self.logger.info(f"Found {len(trip_elements)} total trips")
-            
-            for trip_element in trip_elements:
-                trip_info = self._extract_trip_info(trip_element)
-                
-                # Filter by train type
-                trip_type = trip_info.get('tipo', 'N/A')
-                if (trip_type in self.train_types or 
-                    (trip_type == 'N/A' and 'ALL' in self.train_types)):
-                    trips.append(trip_info)
+            # Read all trip elements in one script call, or from the page source if that fails
+            try:
+                trips_raw = self.driver.execute_script(_EXTRACT_TRIPS_JS)
+                if not isinstance(trips_raw, list):
+                    raise RenfeError(f"script returned {type(trips_raw).__name__} instead of a list")
+            except (WebDriverException, RenfeError) as e:
+                if lxml is None:
+                    raise
+                self.logger.warning(f"Script extraction failed ({e}), parsing page source instead")
+                trips_raw = self._extract_raw_trips_lxml()
+            self.logger.info(f"Found {len(trips_raw)} total trips")
             
-            # Apply time filtering if specified
-            if self.time_filter:
-                trips = self._filter_by_time(trips)
-                    
-            return trips
+            return self._filter_by_type([self._parse_trip(raw) for raw in trips_raw])
             
         except Exception as e:
             self.logger.error(f"Error extracting results: {e}")
             return []
     
-    def _save_screenshot(self, filename: str = "renfe_results.png"):
-        """Save a screenshot of the current page"""
+    def _save_screenshot(self, kind: str = "results"):
+        """Save a screenshot of the current page to renfe_<kind>_<date>.png, writing the file in the background"""
+        filename = f"renfe_{kind}_{self.year}-{self.month:02d}-{self.day:02d}.png"
         try:
-            self.driver.save_screenshot(filename)
-            self.logger.info(f"Screenshot saved to {filename}")
+            # Capture on this thread: the driver must not be shared with the writer thread
+            png = self.driver.get_screenshot_as_png()
         except Exception as e:
             self.logger.error(f"Error saving screenshot: {e}")
+            return
+        
+        def write():
+            try:
+                # Write then rename, so a concurrent search never leaves a half-written file
+                tmp_filename = f"{filename}.{threading.get_ident()}.tmp"
+                with open(tmp_filename, "wb") as f:
+                    f.write(png)
+                os.replace(tmp_filename, filename)
+                self.logger.info(f"Screenshot saved to {filename}")
+            except Exception as e:
+                self.logger.error(f"Error saving screenshot: {e}")
+        
+        # Not a daemon, so the file is still written if the program exits right away
+        threading.Thread(target=write, name="renfe-screenshot").start()
+    
+    def _log_search(self):
+        """Log the search parameters"""
+        self.logger.info(f"Searching tickets from {self.origin} to {self.destination} for {self.date_str}")
+        if self.time_filter:
+            filter_type, time_value = self.time_filter
+            self.logger.info(f"Time filter: {filter_type} {time_value}")
+        self.logger.info(f"Train types: {', '.join(self.train_types)}")
+    
+    def _log_trips(self, trips: List[Dict[str, str]]):
+        """Log the trips found"""
+        if trips:
+            self.logger.info(f"Found {len(trips)} trips matching criteria")
+            if self.verbose and self.logger.isEnabledFor(logging.INFO):
+                for i, trip in enumerate(trips, 1):
+                    self.logger.info("%d. %s - %s to %s - %s", i, trip.get('tipo', 'N/A'), trip.get('salida', 'N/A'),
+                                     trip.get('llegada', 'N/A'), trip.get('precio', 'N/A'))
+        else:
+            self.logger.info("No trips found matching criteria")
+    
+    def _cache_key(self) -> str:
+        """Key identifying this search in the results cache (the time filter is applied afterwards)"""
+        return f"{self.origin}|{self.destination}|{self.date_str}|{','.join(sorted(self.train_types))}"
+    
+    def _cached_trips(self) -> Optional[List[Dict[str, str]]]:
+        """Return results of an identical search younger than cache_ttl, if any"""
+        cache = _get_results_cache() if self.cache_ttl > 0 else None
+        if cache is None:
+            return None
+        entry = cache.get(self._cache_key())
+        
+        # Anything but a (saved_at, trips) pair is treated as a miss
+        try:
+            saved_at, trips = entry
+            if not isinstance(trips, list) or time.time() - saved_at > self.cache_ttl:
+                return None
+        except (TypeError, ValueError):
+            return None
+        self.logger.info("Using cached results")
+        return trips
+    
+    def _finish(self, trips: List[Dict[str, str]], fresh: bool = False) -> List[Dict[str, str]]:
+        """Cache fresh results, apply the time filter and log the outcome"""
+        if fresh and trips and self.cache_ttl > 0:
+            cache = _get_results_cache()
+            if cache is not None:
+                cache.set(self._cache_key(), (time.time(), trips), expire=self.cache_ttl)
+        
+        trips = self._filter_by_time(trips)
+        self._log_trips(trips)
+        return trips
     
     def run(self) -> List[Dict[str, str]]:
         """Execute the scraping process and return results"""
+        self._log_search()
+        
+        trips = self._cached_trips()
+        if trips is not None:
+            return self._finish(trips)
+        
+        return self._finish(self._run_browser(), fresh=True)
+    
+    def _run_browser(self) -> List[Dict[str, str]]:
+        """Drive the Renfe website with Selenium and return results"""
         try:
-            self.logger.info(f"Searching tickets from {self.origin} to {self.destination} for {self.date_str}")
-            if self.time_filter:
-                filter_type, time_value = self.time_filter
-                self.logger.info(f"Time filter: {filter_type} {time_value}")
-            self.logger.info(f"Train types: {', '.join(self.train_types)}")
+            # Borrow a warm browser from the pool
+            self.driver = DriverPool.acquire(self.options, self.profile_dir)
+            ignored = (NoSuchElementException, StaleElementReferenceException)
+            self.wait = WebDriverWait(self.driver, 20, poll_frequency=0.05, ignored_exceptions=ignored)
+            # Short timeout for elements that may legitimately never appear
+            self.wait_fast = WebDriverWait(self.driver, 3, poll_frequency=0.05, ignored_exceptions=ignored)
+            self._block_trackers()
+            self._inject_consent()
             
             # Open Renfe website
             self.driver.get("https://www.renfe.com/es/es")
-            time.sleep(3)  # Give the page time to load properly
+            self.wait.until(EC.presence_of_element_located((By.ID, "origin")))
             
             # Accept cookies
             self._accept_cookies()
             
-            # Fill origin with retry mechanism
+            # Fill origin with retry mechanism. _fill_station clears the field itself, so a retry
+            # just types again; the page is reloaded only before the last attempt or if the input is gone.
             max_attempts = 3
             for attempt in range(max_attempts):
                 try:
@@ -401,14 +832,12 @@ class RenfeSeleniumScraper:
                 except Exception as e:
                     if attempt < max_attempts - 1:
                         self.logger.warning(f"Attempt {attempt + 1} failed to fill origin, retrying...")
-                        time.sleep(2)
-                        self.driver.refresh()
-                        time.sleep(3)
-                        self._accept_cookies()
+                        if attempt == max_attempts - 2 or not self._field_present("origin"):
+                            self._reload_form()
                     else:
                         raise e
             
-            # Fill destination with retry mechanism
+            # Fill destination with retry mechanism (reloading would lose the origin)
             for attempt in range(max_attempts):
                 try:
                     self._fill_station("destination", self.destination, "destination")
@@ -416,7 +845,6 @@ class RenfeSeleniumScraper:
                 except Exception as e:
                     if attempt < max_attempts - 1:
                         self.logger.warning(f"Attempt {attempt + 1} failed to fill destination, retrying...")
-                        time.sleep(2)
                     else:
                         raise e
             
@@ -433,23 +861,65 @@ class RenfeSeleniumScraper:
             if self.verbose:
                 self._save_screenshot()
             
-            # Log results
-            if trips:
-                self.logger.info(f"Found {len(trips)} trips matching criteria")
-                if self.verbose:
-                    for i, trip in enumerate(trips, 1):
-                        self.logger.info(f"{i}. {trip.get('tipo', 'N/A')} - {trip.get('salida', 'N/A')} to {trip.get('llegada', 'N/A')} - {trip.get('precio', 'N/A')}")
-            else:
-                self.logger.info("No trips found matching criteria")
-            
             return trips
             
         except Exception as e:
             self.logger.error(f"Scraping failed: {e}")
-            self._save_screenshot("renfe_error.png")
+            if self.driver is not None:
+                self._save_screenshot("error")
             raise
         finally:
-            self.driver.quit()
+            if self.driver is not None:
+                DriverPool.release(self.driver)
+                self.driver = None
+
+
+def run_many(queries: List[Dict[str, Any]],
+             max_workers: Optional[int] = None) -> List[Union[List[Dict[str, str]], Exception]]:
+    """
+    Run several searches concurrently, each on its own pooled browser.
+    
+    Args:
+        queries: List of keyword-argument dicts for RenfeSeleniumScraper
+        max_workers: Number of concurrent browsers (default: DriverPool.max_size)
+    
+    Returns:
+        One list of trips per query, in the same order as queries; a failed search gets its exception instead
+    """
+    if not queries:
+        return []
+    # Build scrapers up front: __init__ reconfigures logging, which isn't safe to race.
+    # All queries count days from the same "today", even if the batch crosses midnight.
+    today = datetime.now()
+    scrapers = [RenfeSeleniumScraper(**{"today": today, **query}) for query in queries]
+    results: List[Optional[Union[List[Dict[str, str]], Exception]]] = [None] * len(scrapers)
+    
+    # Answer what we can from the results cache
+    for i, scraper in enumerate(scrapers):
+        scraper._log_search()
+        try:
+            cached = scraper._cached_trips()
+            if cached is not None:
+                results[i] = scraper._finish(cached)
+        except Exception as e:
+            scraper.logger.error(f"Search for {scraper.date_str} failed: {e}")
+            results[i] = e
+    
+    # Everything else goes through pooled browsers
+    pending = [i for i, result in enumerate(results) if result is None]
+    if pending:
+        workers = min(len(pending), max_workers or DriverPool.max_size)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {i: executor.submit(scrapers[i]._run_browser) for i in pending}
+        for i, future in futures.items():
+            # One failed search must not discard the others
+            try:
+                results[i] = scrapers[i]._finish(future.result(), fresh=True)
+            except Exception as e:
+                scrapers[i].logger.error(f"Search for {scrapers[i].date_str} failed: {e}")
+                results[i] = e
+    
+    return results
 
 
 def display_results(trips: List[Dict[str, str]], date_str: str):
@@ -478,7 +948,10 @@ def parse_args():
     parser.add_argument("destination", help="Destination station (e.g., 'Barcelona-Sants')")
     
     # Optional arguments
-    parser.add_argument("-d", "--days", type=int, default=1, help="Days from today (0-15, default: 1)")
+    days_group = parser.add_mutually_exclusive_group()
+    days_group.add_argument("-d", "--days", type=int, default=1, help="Days from today (0-15, default: 1)")
+    days_group.add_argument("--days-range", metavar="START-END",
+                          help="Search every day in an inclusive range of days from today, in parallel (e.g., '0-7')")
     parser.add_argument("-t", "--train-types", choices=["AVE", "AVANT", "MD", "ALL"], nargs="+", 
                       default=["AVANT"], help="Train types to include (default: AVANT)")
     
@@ -489,6 +962,8 @@ def parse_args():
     
     # Other options
     parser.add_argument("-q", "--quiet", action="store_true", help="Quiet mode (less verbose output)")
+    parser.add_argument("--cache-ttl", type=int, default=DEFAULT_CACHE_TTL, metavar="SECONDS",
+                      help=f"Reuse results of an identical search for this long (0 disables, default: {DEFAULT_CACHE_TTL})")
     
     args = parser.parse_args()
     
@@ -496,6 +971,18 @@ def parse_args():
     if not 0 <= args.days <= 15:
         parser.error("Days must be between 0 and 15")
     
+    # Expand days range into a list of days
+    if args.days_range:
+        match = _DAYS_RANGE_RE.fullmatch(args.days_range)
+        if not match:
+            parser.error("--days-range must look like START-END (e.g., '0-7')")
+        start, end = map(int, match.groups())
+        if not 0 <= start <= end <= 15:
+            parser.error("--days-range must satisfy 0 <= START <= END <= 15")
+        args.days_list = list(range(start, end + 1))
+    else:
+        args.days_list = [args.days]
+    
     # Create time filter if specified
     time_filter = None
     if args.before and args.after:
@@ -505,6 +992,10 @@ def parse_args():
     elif args.after:
         time_filter = ('after', args.after)
     
+    # Validate the time up front rather than after a full scrape
+    if time_filter and not _TIME_RE.fullmatch(time_filter[1]):
+        parser.error(f"--{time_filter[0]} must be a time as HH:MM (e.g., '08:30')")
+    
     return args, time_filter
 
 
@@ -513,6 +1004,33 @@ def main():
     args, time_filter = parse_args()
     
     try:
+        if len(args.days_list) > 1:
+            # One query per day, scraped in parallel
+            today = datetime.now()
+            queries = [
+                dict(
+                    origin=args.origin,
+                    destination=args.destination,
+                    days_from_now=days,
+                    train_types=args.train_types,
+                    time_filter=time_filter,
+                    verbose=not args.quiet,
+                    cache_ttl=args.cache_ttl,
+                    today=today
+                )
+                for days in args.days_list
+            ]
+            all_results = run_many(queries)
+            failed = False
+            for days, results in zip(args.days_list, all_results):
+                date_str = _format_date(today + timedelta(days=days))
+                if isinstance(results, Exception):
+                    print(f"\n❌ Error for {date_str}: {results}")
+                    failed = True
+                else:
+                    display_results(results, date_str)
+            return 1 if failed else 0
+        
         # Create scraper with command-line arguments
         scraper = RenfeSeleniumScraper(
             origin=args.origin,
@@ -520,7 +1038,8 @@ def main():
             days_from_now=args.days,
             train_types=args.train_types,
             time_filter=time_filter,
-            verbose=not args.quiet
+            verbose=not args.quiet,
+            cache_ttl=args.cache_ttl
         )
         
         # Run scraper
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Station Cache
+---------------------------------
+Persistent cache of station names resolved by the scraper, so each station
+only has to go through the website's autocomplete once. Entries look like:
+
+    {"Girona": {"canonical": "GIRONA"}}
+"""
+
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import logging
+import threading
+
+
+CACHE_FILE = Path.home() / ".cache" / "renfe" / "stations.json"
+
+_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _load() -> Dict[str, Dict[str, str]]:
+    """Read the cache file once per process"""
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable station cache {CACHE_FILE}: {e}")
+        return {}
+
+
+def get_station(name: str) -> Optional[Dict[str, str]]:
+    """Return the cached entry for a station name, or None on a miss"""
+    with _lock:
+        entry = _load().get(name)
+        return dict(entry) if entry else None
+
+
+def set_station(name: str, **fields: str):
+    """Merge fields (e.g. canonical) into a station's entry and persist the cache"""
+    with _lock:
+        stations = _load()
+        entry = stations.setdefault(name, {})
+        if all(entry.get(key) == value for key, value in fields.items()):
+            return
+        entry.update(fields)
+        _save(stations)
+
+
+def delete_station(name: str):
+    """Forget a station, e.g. when its cached entry turned out to be wrong"""
+    with _lock:
+        stations = _load()
+        if stations.pop(name, None) is not None:
+            _save(stations)
+
+
+def _save(stations: Dict[str, Dict[str, str]]):
+    """Write the whole cache atomically (caller holds _lock)"""
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = CACHE_FILE.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(stations, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write station cache {CACHE_FILE}: {e}")
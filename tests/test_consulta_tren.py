@@ -0,0 +1,161 @@
+import sys
+from datetime import datetime
+
+import pytest
+
+import consulta_tren
+from consulta_tren import RenfeSeleniumScraper
+
+
+def make_scraper(**kwargs):
+    kwargs.setdefault("verbose", False)
+    return RenfeSeleniumScraper(**kwargs)
+
+
+@pytest.mark.parametrize("text, minutes", [
+    ("08:30", 510),
+    ("8:30", 510),
+    ("8.30", 510),
+    ("00:00", 0),
+    ("23:59", 1439),
+    ("", -1),
+    ("8h", -1),
+    ("08:30:00", -1),
+])
+def test_to_minutes(text, minutes):
+    assert RenfeSeleniumScraper._to_minutes(text) == minutes
+
+
+TRIPS = [
+    {"salida": "07:00"},
+    {"salida": "08:30"},
+    {"salida": "16:00"},
+    {"salida": "??"},
+    {},
+]
+
+
+def test_filter_before():
+    scraper = make_scraper(time_filter=("before", "08:30"))
+    # Unparseable times are kept, trips without a departure are dropped
+    assert scraper._filter_by_time(TRIPS) == [{"salida": "07:00"}, {"salida": "08:30"}, {"salida": "??"}]
+
+
+def test_filter_after():
+    scraper = make_scraper(time_filter=("after", "08:30"))
+    assert scraper._filter_by_time(TRIPS) == [{"salida": "08:30"}, {"salida": "16:00"}, {"salida": "??"}]
+
+
+def test_no_time_filter():
+    assert make_scraper()._filter_by_time(TRIPS) is TRIPS
+
+
+def test_parse_trip():
+    trip = make_scraper()._parse_trip({
+        "tipo": "Tipo de tren AVANT",
+        "horas": ["08:30 h", "09:08 h"],
+        "duracion": " 38 min ",
+        "precio": "desde 9,85 €",
+        "completo": False,
+    })
+    assert trip == {
+        "tipo": "AVANT",
+        "salida": "08:30",
+        "llegada": "09:08",
+        "duracion": "38 min",
+        "precio": "9,85 €",
+        "completo": False,
+    }
+
+
+def test_parse_trip_missing_fields():
+    assert make_scraper()._parse_trip({"tipo": None, "horas": [], "completo": True}) == {
+        "tipo": "N/A",
+        "completo": True,
+    }
+
+
+def test_date_counts_from_today():
+    scraper = make_scraper(days_from_now=2, today=datetime(2024, 12, 31))
+    assert scraper.date_str == "02/01/2025"
+    assert (scraper.day, scraper.month, scraper.year) == (2, 1, 2025)
+
+
+def parse(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["consulta_tren.py", "Girona", "Barcelona-Sants", *argv])
+    return consulta_tren.parse_args()
+
+
+def test_days_range(monkeypatch):
+    args, _ = parse(monkeypatch, "--days-range", "0-3")
+    assert args.days_list == [0, 1, 2, 3]
+
+
+def test_single_day(monkeypatch):
+    args, _ = parse(monkeypatch, "-d", "2")
+    assert args.days_list == [2]
+
+
+@pytest.mark.parametrize("value", ["3", "3-1", "0-16", "a-b"])
+def test_invalid_days_range(monkeypatch, value):
+    with pytest.raises(SystemExit):
+        parse(monkeypatch, "--days-range", value)
+
+
+@pytest.mark.parametrize("value", ["8", "25:00", "08:61"])
+def test_invalid_time_filter(monkeypatch, value):
+    with pytest.raises(SystemExit):
+        parse(monkeypatch, "--before", value)
+
+
+def test_time_filter(monkeypatch):
+    _, time_filter = parse(monkeypatch, "--after", "16:00")
+    assert time_filter == ("after", "16:00")
+
+
+@pytest.fixture
+def results_cache(tmp_path, monkeypatch):
+    diskcache = pytest.importorskip("diskcache")
+    cache = diskcache.Cache(str(tmp_path / "results"))
+    monkeypatch.setattr(consulta_tren, "_results_cache", cache)
+    yield cache
+    cache.close()
+
+
+def test_cache_roundtrip_applies_time_filter_after(results_cache):
+    trips = [{"tipo": "AVANT", "salida": "07:00"}, {"tipo": "AVANT", "salida": "18:00"}]
+    make_scraper(train_types=["AVANT"])._finish(trips, fresh=True)
+
+    scraper = make_scraper(train_types=["AVANT"], time_filter=("after", "12:00"))
+    cached = scraper._cached_trips()
+    assert cached == trips
+    assert scraper._finish(cached) == [{"tipo": "AVANT", "salida": "18:00"}]
+
+
+def test_cache_respects_reader_ttl(results_cache, monkeypatch):
+    make_scraper(cache_ttl=300)._finish([{"salida": "07:00"}], fresh=True)
+
+    now = consulta_tren.time.time()
+    monkeypatch.setattr(consulta_tren.time, "time", lambda: now + 60)
+    assert make_scraper(cache_ttl=300)._cached_trips() == [{"salida": "07:00"}]
+    assert make_scraper(cache_ttl=10)._cached_trips() is None
+    assert make_scraper(cache_ttl=0)._cached_trips() is None
+
+
+def test_cache_not_written_for_empty_or_cached_results(results_cache):
+    scraper = make_scraper()
+    scraper._finish([], fresh=True)
+    scraper._finish([{"salida": "07:00"}])
+    assert scraper._cached_trips() is None
+
+
+def test_cache_key_separates_searches(results_cache):
+    make_scraper(train_types=["AVE"])._finish([{"salida": "07:00"}], fresh=True)
+    assert make_scraper(train_types=["AVANT"])._cached_trips() is None
+    assert make_scraper(train_types=["AVE"], days_from_now=2)._cached_trips() is None
+
+
+def test_malformed_cache_entry_is_a_miss(results_cache):
+    scraper = make_scraper()
+    results_cache.set(scraper._cache_key(), "garbage")
+    assert scraper._cached_trips() is None
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import station_cache
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "renfe" / "stations.json"
+    monkeypatch.setattr(station_cache, "CACHE_FILE", path)
+    station_cache._load.cache_clear()
+    yield path
+    station_cache._load.cache_clear()
+
+
+def test_miss_returns_none(cache_file):
+    assert station_cache.get_station("Girona") is None
+    assert not cache_file.exists()
+
+
+def test_set_merges_and_persists(cache_file):
+    station_cache.set_station("Girona", canonical="GIRONA")
+    station_cache.set_station("Girona", canonical="GIRONA", extra="x")
+
+    assert station_cache.get_station("Girona") == {"canonical": "GIRONA", "extra": "x"}
+    assert json.loads(cache_file.read_text(encoding="utf-8")) == {
+        "Girona": {"canonical": "GIRONA", "extra": "x"}
+    }
+    # Written through a temporary file that is renamed into place
+    assert not cache_file.with_suffix(".tmp").exists()
+
+
+def test_get_returns_a_copy(cache_file):
+    station_cache.set_station("Girona", canonical="GIRONA")
+    station_cache.get_station("Girona")["canonical"] = "OTHER"
+
+    assert station_cache.get_station("Girona") == {"canonical": "GIRONA"}
+
+
+def test_delete(cache_file):
+    station_cache.set_station("Girona", canonical="GIRONA")
+    station_cache.delete_station("Girona")
+    station_cache.delete_station("Unknown")
+
+    assert station_cache.get_station("Girona") is None
+    assert json.loads(cache_file.read_text(encoding="utf-8")) == {}
+
+
+def test_reloads_from_disk(cache_file):
+    station_cache.set_station("Girona", canonical="GIRONA")
+    station_cache._load.cache_clear()
+
+    assert station_cache.get_station("Girona") == {"canonical": "GIRONA"}
+
+
+def test_unreadable_file_is_ignored(cache_file):
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_text("not json", encoding="utf-8")
+
+    assert station_cache.get_station("Girona") is None